@@ -12,18 +12,33 @@
 # Imports
 ##############################################################################
 
-from . import demos  # noqa
-from . import hello  # noqa
+import importlib
+
 from . import parameters  # noqa
 
+__all__ = ("parameters", "demos", "hello")
+
 ##############################################################################
-# Version
+# Lazy Submodules
 ##############################################################################
 
-# Update in setup.py as well
-__version__ = "0.1.5"
 
-# import pkg_resources
+def __getattr__(name):
+    """Import the demos / hello submodules on first access (PEP 562).
+
+    The demos pull in the streamlit cli machinery which library users
+    relying only on the parameters api don't need.
+    """
+    if name in ("demos", "hello"):
+        module = importlib.import_module(f".{name}", __name__)
+        globals()[name] = module
+        return module
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
-# Streamlit Cloud doesn't handle this one.
-# __version__ = pkg_resources.require('streamlit_parameters')[0].version
+##############################################################################
+# Version
+##############################################################################
+
+# Update in pyproject.toml as well
+__version__ = "0.1.5"
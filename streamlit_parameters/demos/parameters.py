@@ -13,7 +13,6 @@
 ##############################################################################
 
 import datetime
-import functools
 import sys
 import typing
 
@@ -22,6 +21,15 @@ import streamlit.web.cli
 
 import streamlit_parameters
 
+##############################################################################
+# Constants
+##############################################################################
+
+_STRING_LIST_PARAMS = ("flying", "spaghetti", "monster")
+_BOOL_OPTIONS = (True, False)
+_CATEGORIES = ("lasagne", "carbonara", "macaroni")
+_CATEGORY_INDICES = {name: i for i, name in enumerate(_CATEGORIES)}
+
 ##############################################################################
 # Implementation
 ##############################################################################
@@ -42,35 +50,74 @@ def main():
     ####################
     # Parameters
     ####################
-    today = datetime.date.today()
-    seven_days_ago = today - datetime.timedelta(days=7)
-    string_list_params = ["flying", "spaghetti", "monster"]
-    bool_options = [True, False]
+    # Computed once per session so the widget bounds stay stable, even if
+    # the date rolls over mid-session.
+    session_state = streamlit.session_state
+    if "_today" not in session_state:
+        session_state._today = datetime.date.today()
+        session_state._seven_days_ago = session_state._today - datetime.timedelta(days=7)
+        session_state._four_weeks_ago = session_state._today - datetime.timedelta(weeks=4)
+    today = session_state._today
+    seven_days_ago = session_state._seven_days_ago
+    four_weeks_ago = session_state._four_weeks_ago
 
     parameters = streamlit_parameters.parameters.Parameters()
-    parameters.register_bool_parameter(key="foo", default_value=False)
-    parameters.register_int_parameter(key="bar", default_value=5)
-    parameters.register_date_parameter(key="start_date", default_value=seven_days_ago)
-    parameters.register_date_parameter(key="end_date", default_value=today)
-    parameters.register_string_parameter(key="category", default_value="carbonara")
-    parameters.register_float_parameter(key="floating", default_value=5.0)
-    parameters.register_int_range_parameter(key="int_range", default_value=[10, 20])
-    parameters.register_float_range_parameter(key="float_range", default_value=[0.1, 10.0])
-    parameters.register_string_list_parameter(key="string_list", default_value=string_list_params)
-    parameters.register_boolean_list_parameter(key="bool_list", default_value=[True, False])
-    parameters.register_date_range_parameter(key="date_range", default_value=[seven_days_ago, today])
+    parameters.register_many([
+        ("bool", "foo", False),
+        ("int", "bar", 5),
+        ("date", "start_date", seven_days_ago),
+        ("date", "end_date", today),
+        ("string", "category", "carbonara"),
+        ("float", "floating", 5.0),
+        ("int_range", "int_range", [10, 20]),
+        ("float_range", "float_range", [0.1, 10.0]),
+        ("string_list", "string_list", list(_STRING_LIST_PARAMS)),
+        ("bool_list", "bool_list", list(_BOOL_OPTIONS)),
+        ("date_range", "date_range", [seven_days_ago, today]),
+    ])
 
     ####################
     # Widgets
     ####################
+    _render_sidebar(parameters, today, seven_days_ago, four_weeks_ago)
+
+    ####################
+    # Set URL
+    ####################
+    parameters.set_url_fields()
+
+    ####################
+    # Usage
+    ####################
+    streamlit.write("## Usage")
+    usage = (
+        f"**Foo**: {parameters.foo.value}  \n"
+        f"**Bar**: {parameters.bar.value}  \n"
+        f"**Start Date**: {parameters.start_date.value}  \n"
+        f"**End Date**: {parameters.end_date.value}  \n"
+        f"**Category**: {parameters.category.value}"
+    )
+    streamlit.write(usage)
+
+    ####################
+    # Debugging
+    ####################
+    _render_debugging(parameters)
+
+
+def _render_sidebar(
+    parameters: streamlit_parameters.parameters.Parameters,
+    today: datetime.date,
+    seven_days_ago: datetime.date,
+    four_weeks_ago: datetime.date
+):
+    # Not a fragment - widget changes feed the usage section and the url
+    # query string, both of which need the full rerun.
     streamlit.sidebar.checkbox(
         label="Foo",
         value=parameters.foo.value,
         key=parameters.foo.key,
-        on_change=functools.partial(
-            parameters.update_parameter_from_session_state,
-            key=parameters.foo.key
-        )
+        on_change=parameters.callback(parameters.foo.key)
     )
     streamlit.sidebar.number_input(
         label="Bar",
@@ -79,42 +126,30 @@ def main():
         value=parameters.bar.default,
         step=1,
         key=parameters.bar.key,
-        on_change=functools.partial(
-            parameters.update_parameter_from_session_state,
-            key=parameters.bar.key
-        )
+        on_change=parameters.callback(parameters.bar.key)
     )
     streamlit.sidebar.date_input(
         label="Start Date",
         value=parameters.start_date.default,
-        min_value=today - datetime.timedelta(weeks=4),
+        min_value=four_weeks_ago,
         max_value=today,
         key=parameters.start_date.key,
-        on_change=functools.partial(
-            parameters.update_parameter_from_session_state,
-            key=parameters.start_date.key)
+        on_change=parameters.callback(parameters.start_date.key)
     )
     streamlit.sidebar.date_input(
         label="End Date",
         value=parameters.end_date.default,
-        min_value=today - datetime.timedelta(weeks=4),
+        min_value=four_weeks_ago,
         max_value=today,
         key=parameters.end_date.key,
-        on_change=functools.partial(
-            parameters.update_parameter_from_session_state,
-            key=parameters.end_date.key
-        )
+        on_change=parameters.callback(parameters.end_date.key)
     )
-    category_indices = {"lasagne": 0, "carbonara": 1, "macaroni": 2}
     streamlit.sidebar.selectbox(
         label="Choose a Category",
-        index=category_indices[parameters.category.value],
-        options=["lasagne", "carbonara", "macaroni"],
+        index=_CATEGORY_INDICES[parameters.category.value],
+        options=_CATEGORIES,
         key=parameters.category.key,
-        on_change=functools.partial(
-            parameters.update_parameter_from_session_state,
-            key=parameters.category.key
-        )
+        on_change=parameters.callback(parameters.category.key)
     )
 
     streamlit.sidebar.slider(
@@ -124,10 +159,7 @@ def main():
         step=0.1,
         value=parameters.floating.default,
         key=parameters.floating.key,
-        on_change=functools.partial(
-            parameters.update_parameter_from_session_state,
-            key=parameters.floating.key
-        )
+        on_change=parameters.callback(parameters.floating.key)
     )
 
     streamlit.sidebar.slider(
@@ -136,10 +168,7 @@ def main():
         max_value=100,
         value=parameters.int_range.default,
         key=parameters.int_range.key,
-        on_change=functools.partial(
-            parameters.update_parameter_from_session_state,
-            key=parameters.int_range.key
-        )
+        on_change=parameters.callback(parameters.int_range.key)
     )
 
     streamlit.sidebar.slider(
@@ -149,32 +178,23 @@ def main():
         step=0.1,
         value=parameters.float_range.default,
         key=parameters.float_range.key,
-        on_change=functools.partial(
-            parameters.update_parameter_from_session_state,
-            key=parameters.float_range.key
-        )
+        on_change=parameters.callback(parameters.float_range.key)
     )
 
     streamlit.sidebar.multiselect(
         label="Choose a string list",
-        options=string_list_params,
+        options=_STRING_LIST_PARAMS,
         default=parameters.string_list.default,
         key=parameters.string_list.key,
-        on_change=functools.partial(
-            parameters.update_parameter_from_session_state,
-            key=parameters.string_list.key
-        )
+        on_change=parameters.callback(parameters.string_list.key)
     )
 
     streamlit.sidebar.multiselect(
         label="Choose boolean list",
-        options=bool_options,
+        options=_BOOL_OPTIONS,
         default=parameters.bool_list.default,
         key=parameters.bool_list.key,
-        on_change=functools.partial(
-            parameters.update_parameter_from_session_state,
-            key=parameters.bool_list.key
-        )
+        on_change=parameters.callback(parameters.bool_list.key)
     )
 
     streamlit.sidebar.date_input(
@@ -183,45 +203,28 @@ def main():
         max_value=today,
         value=parameters.date_range.default,
         key=parameters.date_range.key,
-        on_change=functools.partial(
-            parameters.update_parameter_from_session_state,
-            key=parameters.date_range.key
-        )
+        on_change=parameters.callback(parameters.date_range.key)
     )
 
     with streamlit.sidebar:
         parameters.create_set_all_checkbox()
 
-    ####################
-    # Set URL
-    ####################
-    parameters.set_url_fields()
-
-    ####################
-    # Usage
-    ####################
-    streamlit.write("## Usage")
-    usage = f"**Foo**: {parameters.foo.value}  \n"
-    usage += f"**Bar**: {parameters.bar.value}  \n"
-    usage += f"**Start Date**: {parameters.start_date.value}  \n"
-    usage += f"**End Date**: {parameters.end_date.value}  \n"
-    usage += f"**Category**: {parameters.category.value}"
-    streamlit.write(usage)
-
-    ####################
-    # Debugging
-    ####################
-    streamlit.write("## Debugging")
 
-    streamlit.write("#### Query String")
-    query_string: typing.Dict[str, str] = streamlit.experimental_get_query_params()
-    streamlit.write(query_string)
+@streamlit.fragment
+def _render_debugging(parameters: streamlit_parameters.parameters.Parameters):
+    # Expander bodies still execute when collapsed, so the parameters dump
+    # is additionally gated by a checkbox (which only reruns this fragment).
+    with streamlit.expander("Debugging", expanded=False):
+        streamlit.write("#### Query String")
+        query_string: typing.Dict[str, str] = streamlit.query_params.to_dict()
+        streamlit.write(query_string)
 
-    streamlit.write("#### Parameters")
-    streamlit.write(parameters.as_dict())
+        streamlit.write("#### Parameters")
+        if streamlit.checkbox("Show parameters", value=False):
+            streamlit.write(parameters.as_dict())
 
-    streamlit.write("#### Session State")
-    streamlit.write(streamlit.session_state)
+        streamlit.write("#### Session State")
+        streamlit.write(streamlit.session_state)
 
 ##############################################################################
 # Entry Points
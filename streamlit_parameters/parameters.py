@@ -12,10 +12,11 @@
 # Imports
 ##############################################################################
 
+from __future__ import annotations
+
 import datetime
-import dateutil.parser
-from distutils import util
-from typing import Callable, Any, List, Tuple
+import functools
+from typing import Callable, Any, Dict, Iterable, List, Optional, Tuple
 
 import streamlit
 
@@ -23,9 +24,84 @@ import streamlit
 # Helper Methods
 ##############################################################################
 
+# sentinel for a not yet serialised Parameter value
+_MISSING = object()
+
+# url field values that parse as True (the truthy values of the
+# retired distutils.util.strtobool), anything else is False
+_BOOL_TRUE = frozenset(("y", "yes", "t", "true", "on", "1"))
+
 
 def _convert_list_or_tuple(values, to_str=str):
-    return "(" + ",".join(to_str(value) for value in values) + ")"
+    return f"({','.join(map(to_str, values))})"
+
+
+def _convert_range(values):
+    if len(values) != 2:
+        # e.g. a date range widget midway through a selection
+        return _convert_list_or_tuple(values)
+    return f"({values[0]},{values[1]})"
+
+
+def _read_list_or_tuple(raw_str, split_sequence=","):
+    # Remove the enclosing brackets, only the one pair.
+    if raw_str.startswith(("(", "[")):
+        raw_str = raw_str[1:]
+    if raw_str.endswith((")", "]")):
+        raw_str = raw_str[:-1]
+    # Remove any whitespace and quotes that may be added around the values.
+    values = [value.strip().strip("'\"") for value in raw_str.split(split_sequence)]
+    # e.g. '' or a one element tuple, ('a',)
+    while values and not values[-1]:
+        values.pop()
+    return values
+
+
+def _parse_range(raw_str, convert_callable):
+    parts = [convert_callable(i) for i in _read_list_or_tuple(raw_str)]
+    assert len(parts) == 2, "Should have 2 parts for a range"
+    return (parts[0], parts[1])
+
+
+def _parse_int_range(raw_str):
+    return _parse_range(raw_str, int)
+
+
+def _parse_float_range(raw_str):
+    return _parse_range(raw_str, float)
+
+
+def _parse_bool(raw_str):
+    return raw_str.strip().lower() in _BOOL_TRUE
+
+
+def _parse_bool_list(raw_str):
+    return [_parse_bool(value) for value in _read_list_or_tuple(raw_str)]
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_iso_date(raw_str: str) -> datetime.date:
+    # Cached since every session opened from the same url parses the same
+    # strings (dates are immutable, so sharing them is safe)
+    return datetime.date.fromisoformat(raw_str)
+
+
+def _parse_date(raw_str: str) -> datetime.date:
+    try:
+        return _parse_iso_date(raw_str)
+    except ValueError:
+        # Not YYYY-MM-DD, fall back to the (much slower) generic parser,
+        # imported only here since most urls never need it
+        import dateutil.parser
+        return dateutil.parser.parse(raw_str).date()
+
+
+def _parse_date_range(raw_str):
+    return _parse_range(raw_str, _parse_date)
+
+
+def _update_parameter_from_session_state(parameter):
+    parameter.update(new_value=streamlit.session_state[parameter.key])
 
 
 ##############################################################################
@@ -35,6 +111,8 @@ def _convert_list_or_tuple(values, to_str=str):
 class Parameter(object):
     """Stores default, current and metadata about a parameter."""
 
+    __slots__ = ("key", "default", "value", "touched", "to_str", "_cached_value", "_cached_str")
+
     def __init__(
         self,
         key: str,
@@ -56,6 +134,8 @@ class Parameter(object):
         self.value: Any = default
         self.touched: bool = touched
         self.to_str = to_str
+        self._cached_value: Any = _MISSING
+        self._cached_str: str = ""
 
     def update(self, new_value: Any):
         """Override the current value.
@@ -66,8 +146,37 @@ class Parameter(object):
         Args:
             new_value: duh, new value
         """
+        if self._unchanged(new_value):
+            # e.g. a widget resubmitting the same value, nothing to do
+            return
         self.value = new_value
         self.touched = True
+        self._cached_value = _MISSING
+
+    def _unchanged(self, new_value: Any) -> bool:
+        value = self.value
+        if not self.touched or new_value is value or type(new_value) is not type(value):
+            # the same object may have been mutated in place, while e.g.
+            # 1 == True would keep the old type (and url string)
+            return False
+        try:
+            return bool(new_value == value)
+        except (TypeError, ValueError):
+            # e.g. numpy arrays, dataframes have no single truth value
+            return False
+
+    @property
+    def cached_str(self) -> str:
+        """Return the url string for the current value.
+
+        The conversion is only redone when the value is replaced (identity
+        check) or updated, so mutate values in place via update().
+        """
+        value = self.value
+        if value is not self._cached_value:
+            self._cached_str = self.to_str(value)
+            self._cached_value = value
+        return self._cached_str
 
     def __repr__(self) -> str:
         """Return the unique representation for the class.
@@ -78,15 +187,6 @@ class Parameter(object):
         return f"Parameter(default={self.default},value={self.value},touched={self.touched})"
 
 
-class AttrDict(dict):
-    """Convenience class that enables attribute access for dictionaries."""
-
-    def __init__(self, *args, **kwargs):
-        """Pass through initialisation to the dict class."""
-        super(AttrDict, self).__init__(*args, **kwargs)
-        self.__dict__ = self
-
-
 ##############################################################################
 # Classes & Methods
 ##############################################################################
@@ -120,10 +220,7 @@ class Parameters(object):
         streamlit.sidebar.date_input(
             value=parameters.start_date.default,  # <-- 2
             key=parameters.start_date.key,  # <-- 3
-            on_change=functools.partial( # <-- 4
-                parameters.update_parameter_from_session_state,
-                key=parameters.start_date.key
-            )
+            on_change=parameters.callback(parameters.start_date.key)  # <-- 4
         )
 
         parameters.set_url_fields()  # <-- 5 (does all fields in one batch call)
@@ -154,12 +251,43 @@ class Parameters(object):
     initial default for a parameter on the session state.
     """
 
+    # parameter kind -> (convert, to_str), see register_many()
+    _KINDS = {
+        "bool": (_parse_bool, str),
+        "int": (int, str),
+        "int_range": (_parse_int_range, _convert_range),
+        "float": (float, str),
+        "float_range": (_parse_float_range, _convert_range),
+        "string": (str, str),
+        "string_list": (_read_list_or_tuple, str),
+        "bool_list": (_parse_bool_list, str),
+        "date": (_parse_date, str),
+        "date_range": (_parse_date_range, _convert_range),
+    }
+
     def __init__(self):
         """Initialise required session state variables."""
-        # using an AttrDict here for convenient attribute referencing on a dict
-        if "_parameters" not in streamlit.session_state:
-            streamlit.session_state._parameters = AttrDict(dict())
-            streamlit.session_state._parameters_set_all = False
+        session_state = streamlit.session_state
+        rerun = "_parameters" in session_state
+        if not rerun:
+            session_state._parameters = {}
+        # Each independently, a session may predate some of these
+        if "_parameters_set_all" not in session_state:
+            session_state._parameters_set_all = False
+        if "_parameters_callbacks" not in session_state:
+            session_state._parameters_callbacks = {}
+        # Parameters are constructed at the top of each script run, so this
+        # is where the url query string snapshot is invalidated
+        session_state._parameters_query_params = None
+        if rerun:
+            # Bind parameters registered on earlier runs directly to the
+            # instance so attribute access skips the __getattr__ fallback.
+            # Names that clash with the class api stay reachable via it.
+            self.__dict__.update(
+                (key, parameter)
+                for key, parameter in session_state._parameters.items()
+                if not hasattr(Parameters, key)
+            )
 
     def __getattr__(self, key: str) -> Parameter:
         """Return the parameter stored on the session state object.
@@ -176,7 +304,11 @@ class Parameters(object):
 
         @raise KeyError: if the parameter does not exist.
         """
-        return streamlit.session_state._parameters[key]
+        parameter = streamlit.session_state._parameters[key]
+        # Only reached if the normal lookup fails, so this never shadows
+        # anything and subsequent lookups will find it on the instance.
+        self.__dict__[key] = parameter
+        return parameter
 
     @staticmethod
     def is_set_all() -> bool:
@@ -215,7 +347,7 @@ class Parameters(object):
         Returns:
             An ordinary (attributeless) dictionary.
         """
-        return dict(streamlit.session_state._parameters.__dict__)
+        return dict(streamlit.session_state._parameters)
 
     @staticmethod
     def register_int_parameter(key: str, default_value: int):
@@ -229,53 +361,7 @@ class Parameters(object):
         @raises:
             ValueError if conversion from a provided str value in the url field fails
         """
-        if Parameters._already_registered(key):
-            return
-        try:
-            parameter = Parameter(
-                key=key, default=int(Parameters._fetch_url_field(key)), touched=True
-            )
-        except KeyError:
-            parameter = Parameter(key=key, default=default_value)
-        streamlit.session_state._parameters[key] = parameter
-
-    @staticmethod
-    def _read_list_or_tuple(key, split_sequence=","):
-        raw_str = Parameters._fetch_url_field(key)
-        if raw_str[0] in ("(", "["):
-            raw_str = raw_str[1:]
-        if raw_str[-1] in (")", "]"):
-            raw_str = raw_str[:-1]
-        new_values = []
-        if raw_str:
-            values = raw_str.split(split_sequence)
-            # Remove any quotes that may be added to the string.
-            for value in values:
-                new_value = value.strip()
-                if new_value[0] == "'":
-                    new_value = new_value[1:]
-                if new_value[-1] == "'":
-                    new_value = new_value[:-1]
-                new_values.append(new_value)
-        return new_values
-
-    @staticmethod
-    def _register_range_parameter(
-        key: str, default_value: Tuple[Any, Any], convert_callable
-    ):
-        if Parameters._already_registered(key):
-            return
-        try:
-            parts = [convert_callable(i) for i in Parameters._read_list_or_tuple(key)]
-            assert len(parts) == 2, "Should have 2 parts for a range"
-            parameter = Parameter(
-                key=key,
-                default=(parts[0], parts[1]),
-                touched=True,
-                to_str=_convert_list_or_tuple)
-        except KeyError:
-            parameter = Parameter(key=key, default=default_value, to_str=_convert_list_or_tuple)
-        streamlit.session_state._parameters[key] = parameter
+        Parameters._register(key, default_value, *Parameters._KINDS["int"])
 
     @staticmethod
     def register_int_range_parameter(key: str, default_value: Tuple[int, int]):
@@ -289,7 +375,7 @@ class Parameters(object):
         @raises:
             ValueError if conversion from a provided str value in the url field fails
         """
-        Parameters._register_range_parameter(key, default_value, int)
+        Parameters._register(key, default_value, *Parameters._KINDS["int_range"])
 
     @staticmethod
     def register_float_parameter(key: str, default_value: float):
@@ -303,15 +389,7 @@ class Parameters(object):
         @raises:
             ValueError if conversion from a provided str value in the url field fails
         """
-        if Parameters._already_registered(key):
-            return
-        try:
-            parameter = Parameter(
-                key=key, default=float(Parameters._fetch_url_field(key)), touched=True
-            )
-        except KeyError:
-            parameter = Parameter(key=key, default=default_value)
-        streamlit.session_state._parameters[key] = parameter
+        Parameters._register(key, default_value, *Parameters._KINDS["float"])
 
     @staticmethod
     def register_float_range_parameter(key: str, default_value: Tuple[int, int]):
@@ -325,7 +403,7 @@ class Parameters(object):
         @raises:
             ValueError if conversion from a provided str value in the url field fails
         """
-        Parameters._register_range_parameter(key, default_value, float)
+        Parameters._register(key, default_value, *Parameters._KINDS["float_range"])
 
     @staticmethod
     def register_string_parameter(key: str, default_value: str):
@@ -336,17 +414,7 @@ class Parameters(object):
         string, or as a fallback, with the provided default value if the key is
         not present in the url query string.
         """
-        if Parameters._already_registered(key):
-            return
-        try:
-            parameter = Parameter(
-                key=key,
-                default=Parameters._fetch_url_field(key),
-                touched=True
-            )
-        except KeyError:
-            parameter = Parameter(key=key, default=default_value)
-        streamlit.session_state._parameters[key] = parameter
+        Parameters._register(key, default_value, *Parameters._KINDS["string"])
 
     @staticmethod
     def register_string_list_parameter(key: str, default_value: List[str]):
@@ -357,15 +425,7 @@ class Parameters(object):
         string, or as a fallback, with the provided default value if the key is
         not present in the url query string.
         """
-        if Parameters._already_registered(key):
-            return
-        try:
-            # Remove the initial and trailing brackets and split it.
-            values = Parameters._read_list_or_tuple(key)
-            parameter = Parameter(key=key, default=values, touched=True)
-        except KeyError:
-            parameter = Parameter(key=key, default=default_value)
-        streamlit.session_state._parameters[key] = parameter
+        Parameters._register(key, default_value, *Parameters._KINDS["string_list"])
 
     @staticmethod
     def register_boolean_list_parameter(key: str, default_value: List[bool]):
@@ -376,16 +436,7 @@ class Parameters(object):
         string, or as a fallback, with the provided default value if the key is
         not present in the url query string.
         """
-        if Parameters._already_registered(key):
-            return
-        try:
-            # Remove the initial and trailing brackets and split it.
-            values = Parameters._read_list_or_tuple(key)
-            new_values = [util.strtobool(value) for value in values]
-            parameter = Parameter(key=key, default=new_values, touched=True)
-        except KeyError:
-            parameter = Parameter(key=key, default=default_value)
-        streamlit.session_state._parameters[key] = parameter
+        Parameters._register(key, default_value, *Parameters._KINDS["bool_list"])
 
     @staticmethod
     def register_date_parameter(key: str, default_value: datetime.date):
@@ -399,17 +450,7 @@ class Parameters(object):
         For an alternative formatting, override the to_str callback in
         Parameter.
         """
-        if Parameters._already_registered(key):
-            return
-        try:
-            parameter = Parameter(
-                key=key,
-                default=dateutil.parser.parse(Parameters._fetch_url_field(key)).date(),
-                touched=True
-            )
-        except KeyError:
-            parameter = Parameter(key=key, default=default_value)
-        streamlit.session_state._parameters[key] = parameter
+        Parameters._register(key, default_value, *Parameters._KINDS["date"])
 
     @staticmethod
     def register_date_range_parameter(key: str, default_value: Tuple[datetime.date, datetime.date]):
@@ -423,25 +464,58 @@ class Parameters(object):
         @raises:
             ValueError if conversion from a provided str value in the url field fails
         """
-        Parameters._register_range_parameter(
-            key, default_value, lambda x: dateutil.parser.parse(x).date()
-        )
+        Parameters._register(key, default_value, *Parameters._KINDS["date_range"])
 
     @staticmethod
     def register_bool_parameter(key: str, default_value: bool):
         """Register a bool parameter."""
-        if Parameters._already_registered(key):
-            return
-        try:
-            s = Parameters._fetch_url_field(key)
-            parameter = Parameter(
-                key=key,
-                default=s.lower() in ["true", "yes"],
-                touched=True
+        Parameters._register(key, default_value, *Parameters._KINDS["bool"])
+
+    @staticmethod
+    def register_many(specs: Iterable[Tuple[str, str, Any]]):
+        """
+        Register a batch of parameters in one call.
+
+        .. code-block:: python
+
+            parameters.register_many([
+                ("bool", "foo", False),
+                ("int", "bar", 5),
+                ("date", "start_date", seven_days_ago),
+            ])
+
+        Supported kinds are bool, int, int_range, float, float_range,
+        string, string_list, bool_list, date and date_range.
+
+        The url query string is consulted once for the whole batch and the
+        new parameters are stored on the session state in a single update.
+
+        Args:
+            specs: (kind, key, default_value) tuples
+
+        @raises:
+            ValueError if a kind is not supported, or conversion from a provided
+            str value in the url field fails
+        """
+        parameters = streamlit.session_state._parameters
+        query_params = Parameters._get_query_params_cached()
+        new_parameters = {}
+        for kind, key, default_value in specs:
+            try:
+                convert, to_str = Parameters._KINDS[kind]
+            except KeyError:
+                raise ValueError(f"unsupported parameter kind '{kind}' [{key}]") from None
+            if key in parameters or key in new_parameters:
+                continue
+            new_parameters[key] = Parameters._create_parameter(
+                key, default_value, query_params.get(key), convert, to_str
             )
-        except KeyError:
-            parameter = Parameter(key=key, default=default_value)
-        streamlit.session_state._parameters[key] = parameter
+        if not new_parameters:
+            return
+        parameters.update(new_parameters)
+        streamlit.session_state._parameters_callbacks.update(
+            {key: Parameters._create_callback(parameter) for key, parameter in new_parameters.items()}
+        )
 
     @staticmethod
     def update_parameter_from_session_state(key: str):
@@ -449,6 +523,8 @@ class Parameters(object):
 
         Use this method with streamlit widget on_change arguments to
         automatically synchronise widget variable changes to parameter changes.
+        Prefer callback(), which returns a ready-made (and reused) callback
+        for the same purpose.
 
         .. code-block:: python
 
@@ -463,8 +539,31 @@ class Parameters(object):
                 )
             )
         """
-        value = getattr(streamlit.session_state, key)
-        Parameters.update_parameter(key, value)
+        streamlit.session_state._parameters[key].update(new_value=streamlit.session_state[key])
+
+    @staticmethod
+    def callback(key: str) -> Callable[[], None]:
+        """Return the on_change callback that synchronises a widget with its parameter.
+
+        The callback is constructed once, when the parameter is registered,
+        and kept on the session state, so reruns hand streamlit the same
+        object rather than a fresh :func:`functools.partial` for every widget,
+        every rerun. It is bound directly to the parameter, so firing it skips
+        the lookup that update_parameter_from_session_state() makes.
+
+        Args:
+            key: parameter (and widget) name
+
+        Returns:
+            A callable suitable for a streamlit widget's on_change argument.
+
+        @raise KeyError: if the parameter does not exist.
+        """
+        callbacks = streamlit.session_state._parameters_callbacks
+        if key not in callbacks:
+            # e.g. registered by an older version that did not keep callbacks
+            callbacks[key] = Parameters._create_callback(streamlit.session_state._parameters[key])
+        return callbacks[key]
 
     @staticmethod
     def update_parameter(key: str, value: Any):
@@ -478,21 +577,76 @@ class Parameters(object):
 
     @staticmethod
     def set_url_fields():
-        """Reflect parameters to the url query string."""
-        values = {}
-        for key, parameter in streamlit.session_state._parameters.items():
-            if Parameters.is_set_all() or parameter.touched:
-                values[key] = parameter.to_str(parameter.value)
-        streamlit.experimental_set_query_params(**values)
+        """Reflect parameters to the url query string.
+
+        The url is only rewritten if the fields differ from its current ones.
+        """
+        session_state = streamlit.session_state
+        parameters = session_state._parameters
+        if session_state._parameters_set_all:
+            values = {key: parameter.cached_str for key, parameter in parameters.items()}
+        else:
+            values = {
+                key: parameter.cached_str
+                for key, parameter in parameters.items()
+                if parameter.touched
+            }
+        # compare with the url itself, app code or page navigation may have
+        # changed it since it was last set
+        if values == streamlit.query_params.to_dict():
+            return
+        streamlit.query_params.from_dict(values)
 
     @staticmethod
-    def _already_registered(key: str) -> bool:
+    def _register(
+        key: str,
+        default_value: Any,
+        convert: Callable[[str], Any],
+        to_str: Callable[[Any], str] = str
+    ):
+        """Register a parameter, initialising it from the url query string if present.
+
+        Args:
+            key: parameter name
+            default_value: fallback if the key is not present in the url query string
+            convert: conversion from the url field's string to the parameter's type
+            to_str: conversion back to a string for the url query string
+        """
         # It will already be registered if you've changed the parameter
         # configuration and reloaded the page, but not the session
-        return key in streamlit.session_state._parameters
+        if key in streamlit.session_state._parameters:
+            return
+        raw_str = Parameters._try_fetch_url_field(key)
+        Parameters._add_parameter(
+            Parameters._create_parameter(key, default_value, raw_str, convert, to_str)
+        )
 
     @staticmethod
-    def _fetch_url_field(key: str) -> str:
+    def _create_parameter(
+        key: str,
+        default_value: Any,
+        raw_str: Optional[str],
+        convert: Callable[[str], Any],
+        to_str: Callable[[Any], str]
+    ) -> Parameter:
+        if raw_str is None:
+            return Parameter(key=key, default=default_value, to_str=to_str)
+        return Parameter(key=key, default=convert(raw_str), touched=True, to_str=to_str)
+
+    @staticmethod
+    def _create_callback(parameter: Parameter) -> Callable[[], None]:
+        # Bound to the parameter itself, the lookup on the session state's
+        # parameters is resolved here once rather than on every widget change.
+        # A partial rather than a closure, it remains picklable.
+        return functools.partial(_update_parameter_from_session_state, parameter)
+
+    @staticmethod
+    def _add_parameter(parameter: Parameter):
+        streamlit.session_state._parameters[parameter.key] = parameter
+        streamlit.session_state._parameters_callbacks[parameter.key] = Parameters._create_callback(parameter)
+
+    @staticmethod
+    def _try_fetch_url_field(key: str) -> Optional[str]:
         """Fetch a single field from the url query string.
 
         Args:
@@ -500,9 +654,29 @@ class Parameters(object):
 
         Returns:
             the parameter value as a string (prior to any necessary conversion)
-
-        Raises:
-            KeyError: if the field does not exist
+            or None if the field does not exist
         """
+        query_params = Parameters._get_query_params_cached()
+        if not query_params:
+            # the common first visit, nothing to look up
+            return None
         # TODO: raise error if multiple values in the query_string exist
-        return streamlit.experimental_get_query_params()[key][0]  # always a list, get the first
+        return query_params.get(key)  # if multiple values exist, this is the last
+
+    @staticmethod
+    def _get_query_params_cached() -> Dict[str, str]:
+        """Fetch the url query string fields, parsing them only once per script run.
+
+        The snapshot is taken on the first lookup in a run and discarded
+        when the next run constructs its Parameters, so parameters registered
+        on later runs see url changes made since (e.g. by app code or page
+        navigation).
+
+        Returns:
+            the url query string fields
+        """
+        query_params = streamlit.session_state._parameters_query_params
+        if query_params is None:
+            query_params = streamlit.query_params.to_dict()
+            streamlit.session_state._parameters_query_params = query_params
+        return query_params
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# License: BSD
+#   https://raw.githubusercontent.com/stonier/streamlit_parameters/devel/LICENSE
+#
+##############################################################################
+# Imports
+##############################################################################
+
+import sys
+
+import pytest
+
+from streamlit_parameters.demos import parameters as demo
+
+##############################################################################
+# Tests
+##############################################################################
+
+
+def test_console_main_environment(monkeypatch, mocker):
+    monkeypatch.setattr(sys, "argv", list(sys.argv))
+    monkeypatch.setenv("STREAMLIT_SERVER_PORT", "8599")
+    monkeypatch.setenv("STREAMLIT_SERVER_HEADLESS", "true")
+    run = mocker.patch("streamlit.web.bootstrap.run")
+    # click exits once the command has run
+    with pytest.raises(SystemExit):
+        demo.console_main()
+    filename, _, _, flag_options = run.call_args.args
+    assert filename == demo.__file__
+    assert flag_options["server_port"] == 8599
+    assert flag_options["server_headless"] is True
@@ -1,7 +1,8 @@
 import datetime
+from unittest import mock
 
 import streamlit as st
-from streamlit_parameters.parameters import Parameters
+from streamlit_parameters.parameters import Parameter, Parameters
 import pytest
 
 sut = "streamlit_parameters.parameters"
@@ -19,10 +20,8 @@ def mock_session_state(mocker):
 def mock_query_params(mocker):
     """Add a pytest fixture that returns a function that mocks query params."""
     def func(key: str, value: str):
-        get_query_params = mocker.patch(
-            sut + ".streamlit.experimental_get_query_params"
-        )
-        get_query_params.return_value = {key: [value]}
+        query_params = mocker.patch(sut + ".streamlit.query_params")
+        query_params.to_dict.return_value = {key: value}
 
     return func
 
@@ -176,9 +175,9 @@ def test_register_string_parameter(
     assert parameter.default == "G'day!"
     assert parameter.value == "Hello"
     assert repr(parameter) == "Parameter(default=G'day!,value=Hello,touched=True)"
-    set_query_params = mocker.patch(sut + ".streamlit.experimental_set_query_params")
+    set_query_params = mocker.patch(sut + ".streamlit.query_params.from_dict")
     Parameters.set_url_fields()
-    set_query_params.assert_called_with(foo="Hello")
+    set_query_params.assert_called_with({"foo": "Hello"})
 
 
 def test_register_string_parameter_not_in_url(
@@ -202,7 +201,7 @@ def test_update_parameter_from_session_state(
     parameter = st.session_state._parameters["foo"]
     assert parameter.default == "G'day!"
     assert parameter.value == "G'day!"
-    st.session_state.foo = "Hello"
+    st.session_state.__getitem__.side_effect = {"foo": "Hello"}.__getitem__
     Parameters.update_parameter_from_session_state("foo")
     assert parameter.default == "G'day!"
     assert parameter.value == "Hello"
@@ -223,14 +222,15 @@ def test_register_string_list_parameter(
         repr(parameter)
         == "Parameter(default=['flying', 'spaghetti', 'monster'],value=['flying', 'spaghetti', 'monster'],touched=True)"
     )
-    set_query_params = mocker.patch(sut + ".streamlit.experimental_set_query_params")
+    set_query_params = mocker.patch(sut + ".streamlit.query_params.from_dict")
     Parameters.set_url_fields()
-    set_query_params.assert_called_with(foo="['flying', 'spaghetti', 'monster']")
+    # the url already holds it
+    set_query_params.assert_not_called()
 
     # Now update value and make sure new value properly serialized in query params
     parameters.foo.update(new_value=["Hello", "world"])
     Parameters.set_url_fields()
-    set_query_params.assert_called_with(foo="['Hello', 'world']")
+    set_query_params.assert_called_with({"foo": "['Hello', 'world']"})
 
 
 def test_register_string_list_parameter_not_in_url(
@@ -249,11 +249,12 @@ def test_register_boolean_list_parameter(
     mock_session_state,
     parameters,
 ):
-    mock_query_params(key="foo", value="[true, false]")
+    mock_query_params(key="foo", value="[true, false, yes, 0]")
     parameters.register_boolean_list_parameter(key="foo", default_value=[])
     parameter = st.session_state._parameters["foo"]
-    assert parameter.default == [True, False]
-    assert parameter.value == [True, False]
+    assert parameter.default == [True, False, True, False]
+    assert parameter.value == [True, False, True, False]
+    assert all(isinstance(value, bool) for value in parameter.value)
 
 
 def test_register_boolean_list_parameter_not_in_url(
@@ -278,9 +279,10 @@ def test_register_date_parameter(
     parameter = st.session_state._parameters["foo"]
     assert parameter.default == datetime.date(2021, 11, 1)
     assert parameter.value == datetime.date(2021, 11, 1)
-    set_query_params = mocker.patch(sut + ".streamlit.experimental_set_query_params")
+    set_query_params = mocker.patch(sut + ".streamlit.query_params.from_dict")
     Parameters.set_url_fields()
-    set_query_params.assert_called_with(foo="2021-11-01")
+    # the url already holds it
+    set_query_params.assert_not_called()
 
 
 def test_register_date_parameter_not_in_url(
@@ -307,10 +309,10 @@ def test_register_date_range_parameter(
     assert parameter.value == (datetime.date(2021, 11, 1), datetime.date(2021, 11, 3))
 
     # Now update value and make sure new value properly serialized in query params
-    set_query_params = mocker.patch(sut + ".streamlit.experimental_set_query_params")
+    set_query_params = mocker.patch(sut + ".streamlit.query_params.from_dict")
     parameters.foo.update(new_value=(datetime.date(2023, 11, 1), datetime.date(2023, 11, 3)))
     Parameters.set_url_fields()
-    set_query_params.assert_called_with(foo='(2023-11-01,2023-11-03)')
+    set_query_params.assert_called_with({"foo": '(2023-11-01,2023-11-03)'})
 
 
 def test_as_dict(
@@ -343,3 +345,260 @@ def test_is_set_all(
 ):
     mock_query_params(key="foo", value="14")
     assert parameters.is_set_all() is False
+
+
+def test_callback(
+    mock_session_state,
+    parameters,
+):
+    parameters.register_int_parameter(key="foo", default_value=3)
+    callback = Parameters.callback("foo")
+    assert Parameters.callback("foo") is callback
+    st.session_state.__getitem__.side_effect = {"foo": 5}.__getitem__
+    callback()
+    assert parameters.foo.default == 3
+    assert parameters.foo.value == 5
+    with pytest.raises(KeyError):
+        Parameters.callback("bar")
+
+
+def test_register_many(
+    mock_query_params,
+    mock_session_state,
+    parameters,
+):
+    mock_query_params(key="bar", value="14")
+    parameters.register_many([
+        ("bool", "foo", True),
+        ("int", "bar", 5),
+        ("string_list", "msgs", ["G'day!"]),
+    ])
+    assert parameters.foo.value is True
+    assert parameters.foo.touched is False
+    assert parameters.bar.value == 14
+    assert parameters.bar.touched is True
+    assert parameters.msgs.value == ["G'day!"]
+    assert Parameters.callback("bar") is Parameters.callback("bar")
+    parameters.register_many([("int", "foo", 3)])
+    assert parameters.foo.value is True
+    with pytest.raises(ValueError):
+        parameters.register_many([("complex", "baz", 1j)])
+
+
+def test_query_params_fetched_per_run(
+    mock_query_params,
+    mock_session_state,
+    parameters,
+):
+    mock_query_params(key="foo", value="14")
+    parameters.register_int_parameter(key="foo", default_value=0)
+    # next run, the url has since changed
+    mock_query_params(key="bar", value="2.5")
+    st.session_state.__contains__.return_value = True
+    rerun_parameters = Parameters()
+    rerun_parameters.register_float_parameter(key="bar", default_value=0.0)
+    assert rerun_parameters.foo.value == 14
+    assert rerun_parameters.bar.value == 2.5
+
+
+def test_session_state_predating_keys(mock_session_state):
+    # e.g. run-on-save with a session created by an older version
+    st.session_state._parameters = {"foo": Parameter(key="foo", default=3)}
+    st.session_state.__contains__.side_effect = lambda key: key == "_parameters"
+    del st.session_state._parameters_callbacks
+    parameters = Parameters()
+    parameters.register_int_parameter(key="bar", default_value=4)
+    assert parameters.foo.value == 3
+    callback = Parameters.callback("foo")
+    assert Parameters.callback("foo") is callback
+    st.session_state.__getitem__.side_effect = {"foo": 5}.__getitem__
+    callback()
+    assert parameters.foo.value == 5
+    assert Parameters.callback("bar") is st.session_state._parameters_callbacks["bar"]
+    with pytest.raises(KeyError):
+        Parameters.callback("baz")
+
+
+def test_query_params_fetched_once(
+    mock_session_state,
+    parameters,
+    mocker,
+):
+    query_params = mocker.patch(sut + ".streamlit.query_params")
+    query_params.to_dict.return_value = {"foo": "14", "bar": "2.5"}
+    parameters.register_int_parameter(key="foo", default_value=0)
+    parameters.register_float_parameter(key="bar", default_value=0.0)
+    parameters.register_string_parameter(key="baz", default_value="G'day!")
+    assert parameters.foo.value == 14
+    assert parameters.bar.value == 2.5
+    assert parameters.baz.value == "G'day!"
+    query_params.to_dict.assert_called_once()
+
+
+def test_register_bool_parameter_truthy_values(
+    mock_query_params,
+    mock_session_state,
+    parameters,
+):
+    for value, expected in (("yes", True), ("On", True), ("1", True), ("no", False), ("0", False)):
+        mock_query_params(key=value, value=value)
+        parameters.register_bool_parameter(key=value, default_value=not expected)
+        st.session_state._parameters_query_params = None
+        assert st.session_state._parameters[value].value is expected
+
+
+def test_set_url_fields_skips_unchanged(
+    mock_session_state,
+    parameters,
+    mocker,
+):
+    url = {}
+    query_params = mocker.patch(sut + ".streamlit.query_params")
+    query_params.to_dict.side_effect = lambda: dict(url)
+    query_params.from_dict.side_effect = lambda values: (url.clear(), url.update(values))
+    parameters.register_int_parameter(key="foo", default_value=0)
+    parameters.foo.update(new_value=14)
+    Parameters.set_url_fields()
+    Parameters.set_url_fields()
+    query_params.from_dict.assert_called_once_with({"foo": "14"})
+    parameters.foo.update(new_value=4)
+    Parameters.set_url_fields()
+    query_params.from_dict.assert_called_with({"foo": "4"})
+    assert query_params.from_dict.call_count == 2
+    # e.g. app code clearing the url, it is restored
+    url.clear()
+    Parameters.set_url_fields()
+    query_params.from_dict.assert_called_with({"foo": "4"})
+    assert query_params.from_dict.call_count == 3
+
+
+def test_register_string_list_parameter_quoting(
+    mock_query_params,
+    mock_session_state,
+    parameters,
+):
+    mock_query_params(key="foo", value=str(["G'day", "mate"]))
+    parameters.register_string_list_parameter(key="foo", default_value=[])
+    assert parameters.foo.value == ["G'day", "mate"]
+    st.session_state._parameters_query_params = None
+    mock_query_params(key="bar", value="[]")
+    parameters.register_string_list_parameter(key="bar", default_value=["unused"])
+    assert parameters.bar.value == []
+    st.session_state._parameters_query_params = None
+    mock_query_params(key="baz", value="[foo,bar (baz)]")
+    parameters.register_string_list_parameter(key="baz", default_value=[])
+    assert parameters.baz.value == ["foo", "bar (baz)"]
+    st.session_state._parameters_query_params = None
+    mock_query_params(key="qux", value=str(("a",)))
+    parameters.register_string_list_parameter(key="qux", default_value=[])
+    assert parameters.qux.value == ["a"]
+
+
+def test_register_date_parameter_not_iso_format(
+    mock_query_params,
+    mock_session_state,
+    parameters,
+):
+    mock_query_params(key="foo", value="Nov 1 2021")
+    parameters.register_date_parameter(key="foo", default_value=None)
+    assert parameters.foo.value == datetime.date(2021, 11, 1)
+
+
+def test_set_url_fields_set_all(
+    mock_session_state,
+    parameters,
+    mocker,
+):
+    parameters.register_int_parameter(key="foo", default_value=3)
+    parameters.register_string_parameter(key="bar", default_value="G'day!")
+    set_query_params = mocker.patch(sut + ".streamlit.query_params").from_dict
+    Parameters.set_url_fields()
+    set_query_params.assert_called_with({})
+    st.session_state._parameters_set_all = True
+    Parameters.set_url_fields()
+    set_query_params.assert_called_with({"foo": "3", "bar": "G'day!"})
+
+
+def test_parameter_cached_str():
+    to_str = mock.Mock(side_effect=str)
+    parameter = Parameter(key="foo", default=[1, 2], to_str=to_str)
+    assert parameter.cached_str == "[1, 2]"
+    assert parameter.cached_str == "[1, 2]"
+    assert to_str.call_count == 1
+    parameter.value.append(3)
+    parameter.update(new_value=parameter.value)
+    assert parameter.cached_str == "[1, 2, 3]"
+    assert to_str.call_count == 2
+
+
+def test_register_range_parameter_partial_selection(
+    mock_session_state,
+    parameters,
+    mocker,
+):
+    parameters.register_date_range_parameter(
+        key="foo",
+        default_value=(datetime.date(2021, 11, 1), datetime.date(2021, 11, 3))
+    )
+    set_query_params = mocker.patch(sut + ".streamlit.query_params").from_dict
+    parameters.foo.update(new_value=(datetime.date(2023, 11, 1),))
+    Parameters.set_url_fields()
+    set_query_params.assert_called_with({"foo": "(2023-11-01)"})
+
+
+def test_parameter_slots():
+    parameter = Parameter(key="foo", default=3)
+    assert not hasattr(parameter, "__dict__")
+    with pytest.raises(AttributeError):
+        parameter.bar = 4
+
+
+def test_parameter_update_unchanged():
+    to_str = mock.Mock(side_effect=str)
+    parameter = Parameter(key="foo", default=[1, 2], to_str=to_str)
+    parameter.update(new_value=[1, 2])
+    assert parameter.touched is True
+    assert parameter.cached_str == "[1, 2]"
+    parameter.update(new_value=[1, 2])
+    assert parameter.cached_str == "[1, 2]"
+    assert to_str.call_count == 1
+
+
+def test_parameter_update_equal_but_not_unchanged():
+    parameter = Parameter(key="foo", default=1)
+    parameter.update(new_value=1)
+    parameter.update(new_value=True)
+    assert parameter.value is True
+    assert parameter.cached_str == "True"
+    parameter.update(new_value=1.0)
+    assert type(parameter.value) is float
+    # no single truth value for an elementwise comparison
+    numpy = pytest.importorskip("numpy")
+    parameter.update(new_value=numpy.array([1, 2]))
+    parameter.update(new_value=numpy.array([1, 3]))
+    assert parameter.value.tolist() == [1, 3]
+
+
+def test_parameters_bound_to_instance(mock_session_state, parameters):
+    parameters.register_int_parameter(key="foo", default_value=3)
+    parameters.register_int_parameter(key="as_dict", default_value=4)
+    assert "foo" not in vars(parameters)
+    assert parameters.foo is st.session_state._parameters["foo"]
+    assert vars(parameters)["foo"] is parameters.foo
+
+    # rerun, parameters are already on the session state
+    st.session_state.__contains__.return_value = True
+    rerun_parameters = Parameters()
+    assert vars(rerun_parameters)["foo"] is st.session_state._parameters["foo"]
+    assert "as_dict" not in vars(rerun_parameters)
+    assert callable(rerun_parameters.as_dict)
+
+
+def test_parameter_repr():
+    parameter = Parameter(key="foo", default=[3])
+    assert repr(parameter) == "Parameter(default=[3],value=[3],touched=False)"
+    parameter.value = 7
+    parameter.touched = True
+    assert repr(parameter) == "Parameter(default=[3],value=7,touched=True)"
+    parameter.default.append(4)
+    assert repr(parameter) == "Parameter(default=[3, 4],value=7,touched=True)"
@@ -111,25 +111,19 @@ pretty_header "PyPi Dependencies"
 python3 -m pip install -U pip
 
 # build environment depedencies
-pip3 install wheel
-pip3 install "setuptools==45.2"
+pip3 install build twine
 
 # Get all dependencies for testing, doc generation (fetches those listed in extra_requires)
 # Tox handles testing dependencies now, but you still need tox and regardless, it's convenient
 # to be able to run the testing tools directly without tox inbetween.
 pip3 install -e .[test]
 
-# Get package dependencies (fetches those listed in install_requires)
-python3 setup.py develop
-
 #############################
 # Aliases
 #############################
 
-alias create-pypi-package="rm -rf build dist && python3 setup.py sdist bdist_wheel && twine upload dist/*"
-alias create-pypi-package-test="rm -rf build dist && python3 setup.py sdist bdist_wheel && twine upload --repository-url https://test.pypi.org/legacy/ dist/*"
-alias create-deb="rm -rf dist deb_dist && python setup.py --command-packages=stdeb.command bdist_deb"
-alias create-source-deb="rm -rf dist deb_dist && python setup.py --command-packages=stdeb.command sdist_deb"
+alias create-pypi-package="rm -rf build dist && python3 -m build && twine upload dist/*"
+alias create-pypi-package-test="rm -rf build dist && python3 -m build && twine upload --repository-url https://test.pypi.org/legacy/ dist/*"
 alias tox-all="tox -e py38"
 alias tox-flake8="tox -e flake8"
 
@@ -145,8 +139,6 @@ echo -e ""
 echo -e "${GREEN}Aliases${RESET}"
 echo -e "${CYAN} - ${YELLOW}create-pypi-package${RESET}"
 echo -e "${CYAN} - ${YELLOW}create-pypi-package-test${RESET}"
-echo -e "${CYAN} - ${YELLOW}create-deb${RESET}"
-echo -e "${CYAN} - ${YELLOW}create-source-deb${RESET}"
 echo -e "${CYAN} - ${YELLOW}tox-all${RESET}"
 echo -e "${CYAN} - ${YELLOW}tox-flake8${RESET}"
 echo ""